@@ -19,7 +19,11 @@ from typing import List, Union, Tuple
 
 def draw_graph(coupling_map: List[Union[Tuple[int, int], Tuple[Node, Node]]]):
     coupling_graph = nx.Graph(coupling_map)
-    nx.draw(coupling_graph, labels={node: node for node in coupling_graph.nodes()})
+    nx.draw(
+        coupling_graph,
+        pos=nx.kamada_kawai_layout(coupling_graph),
+        labels={node: node for node in coupling_graph.nodes()},
+    )
 
 
 simple_coupling_map = [(0, 1), (1, 2), (2, 3)]
@@ -39,34 +43,21 @@ draw_graph(id_coupling_map)
 
 # We can also create an ID with an arbitrary-dimensional index. Let us make a 2x2x2 cube:
 
-node_000 = Node("cube", [0, 0, 0])
-node_001 = Node("cube", [0, 0, 1])
-node_010 = Node("cube", [0, 1, 0])
-node_011 = Node("cube", [0, 1, 1])
-node_100 = Node("cube", [1, 0, 0])
-node_101 = Node("cube", [1, 0, 1])
-node_110 = Node("cube", [1, 1, 0])
-node_111 = Node("cube", [1, 1, 1])
+cube_nodes = [Node("cube", [(i >> 2) & 1, (i >> 1) & 1, i & 1]) for i in range(8)]
+
+# Two corners of the cube are connected when their indices differ in exactly one coordinate, so we can generate the coupling map rather than writing out all 12 edges by hand:
 
 cube_coupling_map = [
-    (node_000, node_001),
-    (node_000, node_010),
-    (node_010, node_011),
-    (node_001, node_011),
-    (node_000, node_100),
-    (node_001, node_101),
-    (node_010, node_110),
-    (node_011, node_111),
-    (node_100, node_101),
-    (node_100, node_110),
-    (node_110, node_111),
-    (node_101, node_111),
+    (cube_nodes[i], cube_nodes[j])
+    for i in range(8)
+    for j in range(i + 1, 8)
+    if bin(i ^ j).count("1") == 1
 ]
 
 cube_architecture = Architecture(cube_coupling_map)
 draw_graph(cube_coupling_map)
 
-# To avoid that tedium though we could just use our SquareGrid Architecture:
+# Even simpler, we could just use our SquareGrid Architecture:
 
 from pytket.architecture import SquareGrid
 
@@ -100,7 +91,7 @@ lexi_route = LexiRouteRoutingMethod(10)
 from pytket import Circuit, OpType
 from pytket.circuit import display
 
-c = (
+example_circ = (
     Circuit(4)
     .CX(0, 1)
     .CX(1, 2)
@@ -111,6 +102,7 @@ c = (
     .CX(0, 1)
     .measure_all()
 )
+c = example_circ.copy()
 display.render_circuit_jupyter(c)
 
 # We can also look at which logical qubits are interacting.
@@ -128,19 +120,9 @@ display.render_circuit_jupyter(c)
 
 Graph(c).get_qubit_graph()
 
-# The resulting circuit may also change if we reduce the lookahead parameter.
+# The resulting circuit may also change if we reduce the lookahead parameter. We take a fresh copy of the original circuit, since `route_circuit` modifies its argument in place.
 
-c = (
-    Circuit(4)
-    .CX(0, 1)
-    .CX(1, 2)
-    .CX(0, 2)
-    .CX(0, 3)
-    .CX(2, 3)
-    .CX(1, 3)
-    .CX(0, 1)
-    .measure_all()
-)
+c = example_circ.copy()
 mapping_manager.route_circuit(c, [lexi_label, LexiRouteRoutingMethod(1)])
 display.render_circuit_jupyter(c)
 
@@ -154,17 +136,7 @@ from pytket.placement import Placement, LinePlacement, GraphPlacement
 
 line_placement = LinePlacement(id_architecture)
 
-c = (
-    Circuit(4)
-    .CX(0, 1)
-    .CX(1, 2)
-    .CX(0, 2)
-    .CX(0, 3)
-    .CX(2, 3)
-    .CX(1, 3)
-    .CX(0, 1)
-    .measure_all()
-)
+c = example_circ.copy()
 line_placement.place(c)
 
 display.render_circuit_jupyter(c)
@@ -396,17 +368,7 @@ cry_rmc = RoutingMethodCircuit(distance2_CRy_decomp, 1, 1)
 
 # If we pass it a full CX circuit without `LexiRouteRoutingMethod`, we should find that `MappingManager` throws an error, as none of the passed methods can route for the given circuit.
 
-c = (
-    Circuit(4)
-    .CX(0, 1)
-    .CX(1, 2)
-    .CX(0, 2)
-    .CX(0, 3)
-    .CX(2, 3)
-    .CX(1, 3)
-    .CX(0, 1)
-    .measure_all()
-)
+c = example_circ.copy()
 place_with_map(c, naive_map)
 try:
     mapping_manager.route_circuit(c, [cry_rmc])
@@ -415,17 +377,7 @@ except RuntimeError:
 
 # Alternatively, we can add `LexiRouteRoutingMethod` on top:
 
-c = (
-    Circuit(4)
-    .CX(0, 1)
-    .CX(1, 2)
-    .CX(0, 2)
-    .CX(0, 3)
-    .CX(2, 3)
-    .CX(1, 3)
-    .CX(0, 1)
-    .measure_all()
-)
+c = example_circ.copy()
 place_with_map(c, naive_map)
 mapping_manager.route_circuit(c, [cry_rmc, LexiRouteRoutingMethod(10)])
 display.render_circuit_jupyter(c)
@@ -42,9 +42,10 @@ from qiskit.algorithms.optimizers import SPSA
 from qiskit.circuit.library import EfficientSU2
 
 
-def vqe_solve(op, maxiter, qestimator):
+def vqe_solve(op, maxiter, qestimator, ansatz=None):
     optimizer = SPSA(maxiter=maxiter)
-    ansatz = EfficientSU2(op.num_qubits, entanglement="linear")
+    if ansatz is None:
+        ansatz = EfficientSU2(op.num_qubits, entanglement="linear")
     vqe = VQE(estimator=qestimator, ansatz=ansatz, optimizer=optimizer)
     return vqe.compute_minimum_eigenvalue(op).eigenvalue
 
@@ -79,3 +80,22 @@ qestimator2 = BackendEstimator(qis_backend2, options={"shots": 8192})
 # #print("VQE result (with optimisation):", vqe_solve(H2_op, 50, qestimator2))
 
 # These are small two-qubit circuits, so the improvement may be small, but with larger, more complex circuits, the reduction in noise from compilation will make a greater difference and allow VQE experiments to converge with fewer iterations.
+
+# The compilation pass given to `TketBackend` is applied to every circuit it receives, so the expensive optimisation is repeated at each of the VQE iterations, even though only the parameter values of the ansatz change between them. We can avoid this by optimising the parameterised ansatz once with `pytket`, using symbolic compilation, and handing the optimised ansatz to VQE. We also rebase the ansatz to the gate set of the device as part of the same `pytket` pass, so it is already expressed in the backend's native gates and Qiskit's transpilation inside `BackendEstimator` has little left to do. The backend then only needs the cheapest compilation level to satisfy the constraints of the device for each circuit.
+
+from pytket.extensions.qiskit import qiskit_to_tk, tk_to_qiskit
+from pytket.passes import FullPeepholeOptimise, SequencePass
+
+
+def tket_optimised_ansatz(num_qubits, backend):
+    ansatz = EfficientSU2(num_qubits, entanglement="linear")
+    tk_ansatz = qiskit_to_tk(ansatz.decompose())
+    SequencePass([FullPeepholeOptimise(), backend.rebase_pass()]).apply(tk_ansatz)
+    return tk_to_qiskit(tk_ansatz)
+
+
+optimised_ansatz = tket_optimised_ansatz(H2_op.num_qubits, b_emu)
+qis_backend3 = TketBackend(b_emu, b_emu.default_compilation_pass(optimisation_level=0))
+qestimator3 = BackendEstimator(qis_backend3, options={"shots": 8192})
+
+# #print("VQE result (with symbolic pre-compilation):", vqe_solve(H2_op, 50, qestimator3, optimised_ansatz))
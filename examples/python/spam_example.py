@@ -36,7 +36,7 @@ nx.draw(manila_graph, labels={node: node for node in manila_graph.nodes()})
 #
 # Correlated errors are usually dependent on the connectivity layout of devices, as shown above.
 #
-# As manila is a small 5-qubit device with few connections, let's assume that all qubits have correlated SPAM errors. The number of calibration circuits produced is exponential in the maximum number of correlated circuits, so finding good subsets of correlated qubits is important for characterising larger devices with smaller experimental overhead.
+# The number of calibration circuits produced is exponential in the maximum number of correlated qubits, so finding good subsets of correlated qubits is important for characterising larger devices with smaller experimental overhead. Assuming that all 5 qubits of manila are correlated would need 32 calibration circuits. Instead, let's assume that SPAM errors are only correlated within disjoint neighbouring pairs of qubits (plus one single qubit), which we pick from the coupling edges of the device. Correlations across the remaining edges are ignored. Calibration circuits for the different subsets are run in parallel, so this needs far fewer circuits.
 #
 # We can produce an ```IBMQEmulatorBackend``` to run this. This uses a noise model from ```ibmq_manila``` produced using qiskit-aer. We can then execute all calibration circuits through the backend.
 
@@ -44,20 +44,24 @@ from pytket.extensions.qiskit import IBMQEmulatorBackend, AerBackend
 
 n_shots = 8192
 pytket_noisy_sim_backend = IBMQEmulatorBackend("ibmq_manila")
-manila_node_subsets = pytket_noisy_sim_backend.backend_info.architecture.nodes
-manila_spam = SpamCorrecter([manila_node_subsets], pytket_noisy_sim_backend)
+manila_architecture = pytket_noisy_sim_backend.backend_info.architecture
+paired_nodes = set()
+manila_node_subsets = []
+for node_a, node_b in manila_architecture.coupling:
+    if node_a not in paired_nodes and node_b not in paired_nodes:
+        manila_node_subsets.append([node_a, node_b])
+        paired_nodes.update((node_a, node_b))
+manila_node_subsets += [
+    [node] for node in manila_architecture.nodes if node not in paired_nodes
+]
+manila_spam = SpamCorrecter(manila_node_subsets, pytket_noisy_sim_backend)
 
 # The SpamCorrecter uses these subsets of qubits to produce calibration circuits.
 
 calibration_circuits = manila_spam.calibration_circuits()
 print("Number of calibration circuits: ", len(calibration_circuits))
 
-sim_handles = pytket_noisy_sim_backend.process_circuits(calibration_circuits, n_shots)
-
-# Count results from the simulator are then used to calculate the matrices used for SPAM correction for ```ibmq_manila```.
-
-sim_count_results = pytket_noisy_sim_backend.get_results(sim_handles)
-manila_spam.calculate_matrices(sim_count_results)
+# We will correct the results of a GHZ circuit run on the same backend. Compiling it now lets us submit it together with the calibration circuits, so everything runs as a single batch.
 
 from pytket import Circuit
 
@@ -69,7 +73,17 @@ ghz_circuit = (
     .measure_all()
 )
 ghz_circuit = pytket_noisy_sim_backend.get_compiled_circuit(ghz_circuit)
-ghz_noisy_handle = pytket_noisy_sim_backend.process_circuit(ghz_circuit, n_shots)
+
+all_handles = pytket_noisy_sim_backend.process_circuits(
+    calibration_circuits + [ghz_circuit], n_shots
+)
+sim_handles = all_handles[:-1]
+ghz_noisy_handle = all_handles[-1]
+
+# Count results from the simulator are then used to calculate the matrices used for SPAM correction for ```ibmq_manila```.
+
+sim_count_results = pytket_noisy_sim_backend.get_results(sim_handles)
+manila_spam.calculate_matrices(sim_count_results)
 ghz_noisy_result = pytket_noisy_sim_backend.get_result(ghz_noisy_handle)
 
 # We also run a noiseless simulation so we can compare performance.
@@ -94,24 +108,17 @@ ghz_spam_corrected_result = manila_spam.correct_counts(
 
 # Import and define the Jensen-Shannon divergence, which we will use for comparing performance. The Jensen-Shannon divergence is a symmetric and finite measure of similarity between two probability distributions. A smaller divergence implies more similarity between two probability distributions.
 
-from scipy.stats import entropy
+from scipy.special import rel_entr
 import numpy as np
-import itertools
-
-
-def binseq(k):
-    return ["".join(x) for x in itertools.product("01", repeat=k)]
 
 
 def probs_from_counts(result):
     counts = result.get_counts()
-    counts_dict = dict()
-    for x in counts:
-        counts_dict["".join(str(e) for e in x)] = counts[x]
-    converted = []
-    binary_strings = binseq(len(list(counts.keys())[0]))
-    for b in binary_strings:
-        converted.append(counts_dict.get(b, 0))
+    outcomes = np.array(list(counts), dtype=np.int64)
+    n_bits = outcomes.shape[1]
+    indices = outcomes @ (1 << np.arange(n_bits - 1, -1, -1))
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    converted = np.bincount(indices, weights=weights, minlength=2**n_bits)
     return converted / np.sum(converted)
 
 
@@ -119,7 +126,7 @@ def JSD(P, Q):
     _P = P / np.linalg.norm(P, ord=1)
     _Q = Q / np.linalg.norm(Q, ord=1)
     _M = 0.5 * (_P + _Q)
-    return 0.5 * (entropy(_P, _M) + entropy(_Q, _M))
+    return 0.5 * (np.sum(rel_entr(_P, _M)) + np.sum(rel_entr(_Q, _M)))
 
 
 # Convert our counts results to a probability distribution over the basis states for comparison.
@@ -127,6 +134,7 @@ def JSD(P, Q):
 ghz_noiseless_probabilities = probs_from_counts(ghz_noiseless_result)
 ghz_noisy_probabilities = probs_from_counts(ghz_noisy_result)
 ghz_spam_corrected_probabilities = probs_from_counts(ghz_spam_corrected_result)
+bayesian_jsd = JSD(ghz_noiseless_probabilities, ghz_spam_corrected_probabilities)
 
 print(
     "Jensen-Shannon Divergence between noiseless simulation probability distribution and noisy simulation probability distribution: ",
@@ -134,7 +142,7 @@ print(
 )
 print(
     "Jensen-Shannon Divergence between noiseless simulation probability distribution and spam corrected noisy simulation probability distribution: ",
-    JSD(ghz_noiseless_probabilities, ghz_spam_corrected_probabilities),
+    bayesian_jsd,
 )
 
 # In our noisy simulated case, spam corrected results produced a distribution closer to the expected distribution.
@@ -150,7 +158,7 @@ ghz_invert_probabilities = probs_from_counts(ghz_invert_corrected_result)
 
 print(
     "Jensen-Shannon Divergence between noiseless simulation probability distribution and Bayesian-corrected noisy simulation probability distribution: ",
-    JSD(ghz_noiseless_probabilities, ghz_spam_corrected_probabilities),
+    bayesian_jsd,
 )
 print(
     "Jensen-Shannon Divergence between noiseless simulation probability distribution and invert-corrected noisy simulation probability distribution: ",
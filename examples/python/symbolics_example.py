@@ -72,6 +72,17 @@ render_circuit_jupyter(circ)
 
 render_circuit_jupyter(symbol_circ)
 
+# In a variational algorithm the same compiled circuit is instantiated many times with different parameter values. We reuse the symbols `a` and `b` that we created at the start, rather than calling `fresh_symbol` again, and substitute into a new copy of `symbol_circ` for each set of values.
+
+parameter_values = [(0.1, 0.2), (0.5, 0.75), (1.5, 0.0)]
+instantiated_circs = []
+for a_val, b_val in parameter_values:
+    instance = symbol_circ.copy()
+    instance.symbol_substitution({a: a_val, b: b_val})
+    instantiated_circs.append(instance)
+
+render_circuit_jupyter(instantiated_circs[-1])
+
 # Note: the expression tree for this symbolic expression is very small, consisting of only a couple of different operations, but tket is capable of handling large and complex expressions containing many different types of operation, such as trigonometric functions.
 #
 # It is usually possible to instantiate a symbolic circuit with specific values that allow further optimisation: for example, if we had chosen $a=1.5$ and $b=0$, this circuit would be reduce to the identity. If there are likely to be many parameters set to trivial values (such as $0$ or $1$), it can be beneficial to perform further optimisation after instantiation.
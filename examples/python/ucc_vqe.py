@@ -62,12 +62,13 @@ backend = AerBackend()
 
 
 def objective(params):
+    ansatz = hea(params)
     energy = 0
     for term, coeff in hamiltonian.terms.items():
         if not term:
             energy += coeff
             continue
-        circ = hea(params)
+        circ = ansatz.copy()
         circ.add_c_register("c", len(term))
         for i, (q, pauli) in enumerate(term):
             if pauli == "X":
@@ -210,20 +211,16 @@ pauli_sym = {"I": Pauli.I, "X": Pauli.X, "Y": Pauli.Y, "Z": Pauli.Z}
 
 def qps_from_openfermion(paulis):
     """Convert OpenFermion tensor of Paulis to pytket QubitPauliString."""
-    qlist = []
-    plist = []
-    for q, p in paulis:
-        qlist.append(Qubit(q))
-        plist.append(pauli_sym[p])
+    qlist = [Qubit(q) for q, _ in paulis]
+    plist = [pauli_sym[p] for _, p in paulis]
     return QubitPauliString(qlist, plist)
 
 
 def qpo_from_openfermion(openf_op):
     """Convert OpenFermion QubitOperator to pytket QubitPauliOperator."""
-    tk_op = dict()
-    for term, coeff in openf_op.terms.items():
-        string = qps_from_openfermion(term)
-        tk_op[string] = coeff
+    tk_op = {
+        qps_from_openfermion(term): coeff for term, coeff in openf_op.terms.items()
+    }
     return QubitPauliOperator(tk_op)
 
 
@@ -282,15 +279,18 @@ FullPeepholeOptimise().apply(test_circuit)
 print("CX count after PS+FPO", test_circuit.n_gates_of_type(OpType.CX))
 print("CX depth after PS+FPO", test_circuit.depth_by_type(OpType.CX))
 
-# To include this into our routines, we can just add the simplification passes to the objective function. The `get_operator_expectation_value` utility handles compiling to meet the requirements of the backend, so we don't have to worry about that here.
+# To include this into our routines, we can just add the simplification passes to the objective function, combined into a single `SequencePass` which is constructed once and applied on each call. The `get_operator_expectation_value` utility handles compiling to meet the requirements of the backend, so we don't have to worry about that here.
 
 # Objective function with circuit simplification:
 
+from pytket.passes import SequencePass
+
+simplification_pass = SequencePass([PauliSimp(), FullPeepholeOptimise()])
+
 
 def objective(params):
     circ = ucc(params)
-    PauliSimp().apply(circ)
-    FullPeepholeOptimise().apply(circ)
+    simplification_pass.apply(circ)
     return (
         get_operator_expectation_value(circ, hamiltonian_op, backend, n_shots=4000)
         + nuclear_repulsion_energy
@@ -381,18 +381,18 @@ def objective(params):
 # - symbolic circuit compilation;
 # - measurement reduction for expectation value calculations.
 
-# For the sake of completeness, the following gives the full code for the final solution, including passing the objective function to a classical optimiser to find the ground state:
+# For the sake of completeness, the following gives the full code for the final solution, including passing the objective function to a classical optimiser to find the ground state. Since the Hamiltonian is fixed, the final solution replaces the `get_operator_expectation_value` call with its implementation so that the measurement reduction is performed once, outside of the objective function. Each measurement circuit is built and compiled once from the symbolic ansatz, and the objective function only has to instantiate the parameters and process the results. Substituting values for the symbols does not change which gates are used, so the instantiated circuits still satisfy the backend's requirements and we can skip re-validating them with `valid_check=False`.
 
 import openfermion as of
 from scipy.optimize import minimize
 from sympy import symbols
 
 from pytket.extensions.qiskit import AerBackend
-from pytket.circuit import Circuit, Qubit
-from pytket.partition import PauliPartitionStrat
+from pytket.circuit import Bit, Circuit, Qubit
+from pytket.partition import PauliPartitionStrat, measurement_reduction
 from pytket.passes import GuidedPauliSimp, FullPeepholeOptimise
 from pytket.pauli import Pauli, QubitPauliString
-from pytket.utils import get_operator_expectation_value, gen_term_sequence_circuit
+from pytket.utils import expectation_from_shots, gen_term_sequence_circuit
 from pytket.utils.operators import QubitPauliOperator
 
 # Obtain electronic Hamiltonian:
@@ -421,20 +421,16 @@ pauli_sym = {"I": Pauli.I, "X": Pauli.X, "Y": Pauli.Y, "Z": Pauli.Z}
 
 def qps_from_openfermion(paulis):
     """Convert OpenFermion tensor of Paulis to pytket QubitPauliString."""
-    qlist = []
-    plist = []
-    for q, p in paulis:
-        qlist.append(Qubit(q))
-        plist.append(pauli_sym[p])
+    qlist = [Qubit(q) for q, _ in paulis]
+    plist = [pauli_sym[p] for _, p in paulis]
     return QubitPauliString(qlist, plist)
 
 
 def qpo_from_openfermion(openf_op):
     """Convert OpenFermion QubitOperator to pytket QubitPauliOperator."""
-    tk_op = dict()
-    for term, coeff in openf_op.terms.items():
-        string = qps_from_openfermion(term)
-        tk_op[string] = coeff
+    tk_op = {
+        qps_from_openfermion(term): coeff for term, coeff in openf_op.terms.items()
+    }
     return QubitPauliOperator(tk_op)
 
 
@@ -479,27 +475,45 @@ ucc = gen_term_sequence_circuit(excitation_op, ucc_ref)
 GuidedPauliSimp().apply(ucc)
 FullPeepholeOptimise().apply(ucc)
 
-# Connect to a simulator/device:
+# Measurement reduction and symbolic measurement circuits:
+
+measurement_setup = measurement_reduction(
+    [qps_from_openfermion(term) for term in hamiltonian.terms if term],
+    PauliPartitionStrat.CommutingSets,
+)
+constant_energy = hamiltonian.terms.get((), 0.0) + nuclear_repulsion_energy
+measurement_circs = []
+for mc in measurement_setup.measurement_circs:
+    circ = ucc.copy()
+    circ.append(mc)
+    measurement_circs.append(circ)
+
+# Connect to a simulator/device and compile the symbolic measurement circuits for it:
 
 backend = AerBackend()
+compiled_measurement_circs = backend.get_compiled_circuits(measurement_circs)
 
 # Objective function:
 
 
 def objective(params):
-    circ = ucc.copy()
     sym_map = dict(zip(syms, params))
-    circ.symbol_substitution(sym_map)
-    return (
-        get_operator_expectation_value(
-            circ,
-            hamiltonian_op,
-            backend,
-            n_shots=4000,
-            partition_strat=PauliPartitionStrat.CommutingSets,
-        )
-        + nuclear_repulsion_energy
-    ).real
+    circs = []
+    for symbolic_circ in compiled_measurement_circs:
+        circ = symbolic_circ.copy()
+        circ.symbol_substitution(sym_map)
+        circs.append(circ)
+    handles = backend.process_circuits(circs, n_shots=4000, valid_check=False)
+    results = backend.get_results(handles)
+    energy = constant_energy
+    for qps, bitmaps in measurement_setup.results.items():
+        for bm in bitmaps:
+            shots = results[bm.circ_index].get_shots([Bit(i) for i in bm.bits])
+            value = expectation_from_shots(shots)
+            if bm.invert:
+                value = -value
+            energy += complex(hamiltonian_op[qps]) * value / len(bitmaps)
+    return energy.real
 
 
 # Optimise against the objective function:
@@ -510,6 +524,5 @@ initial_params = [1e-4, 1e-4, 4e-1]
 # #print("Final energy value", result.fun)
 
 # Exercises:
-# - Replace the `get_operator_expectation_value` call with its implementation and use this to pull the analysis for measurement reduction outside of the objective function, so our circuits can be fully determined and compiled once. This means that the `symbol_substitution` method will need to be applied to each measurement circuit instead of just the state preparation circuit.
 # - Use the `SpamCorrecter` class to add some mitigation of the measurement errors. Start by running the characterisation circuits first, before your main VQE loop, then apply the mitigation to each of the circuits run within the objective function.
 # - Change the `backend` by passing in a `Qiskit` `NoiseModel` to simulate a noisy device. Compare the accuracy of the objective function both with and without the circuit simplification. Try running a classical optimiser over the objective function and compare the convergence rates with different noise models. If you have access to a QPU, try changing the `backend` to connect to that and compare the results to the simulator.